@@ -4,21 +4,83 @@ MotherDuck MCP Server - A FastMCP server for DuckDB and MotherDuck.
 This module provides the CLI entry point for the MCP server.
 """
 
+import functools
 import logging
+import sys
 import warnings
 
 import click
 
 from .configs import SERVER_LOCALHOST, SERVER_VERSION
-from .server import create_mcp_server
 
 __version__ = SERVER_VERSION
 
 logger = logging.getLogger("mcp_server_motherduck")
-logging.basicConfig(level=logging.INFO, format="[motherduck] %(levelname)s - %(message)s")
+# Only configure our own logger, and only if neither it nor the host application
+# has set up handlers already, so embedding apps keep control of logging.
+if not logger.handlers and not logging.getLogger().handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("[motherduck] %(levelname)s - %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
 
+_VERSION_BANNER = f"🦆 MotherDuck MCP Server v{SERVER_VERSION}"
+_READY_MESSAGE = "Ready to execute SQL queries via DuckDB/MotherDuck"
+# Database mode labels, indexed by (read-write, read-only, read-only persistent)
+_MODE_STRINGS = ("read-write", "read-only", "read-only (persistent connection)")
 
-@click.command()
+# ANSI colors only when stderr is an interactive terminal, not when piped to a log file
+_ANSI = sys.stderr is not None and sys.stderr.isatty()
+_GREEN = "\033[32m" if _ANSI else ""
+_BOLD_CYAN = "\033[1m\033[36m" if _ANSI else ""
+_RESET = "\033[0m" if _ANSI else ""
+_HTTP_MODE_MESSAGE = f"MCP server initialized in {_GREEN}http{_RESET} mode"
+_STDIO_MODE_MESSAGE = f"MCP server initialized in {_GREEN}stdio{_RESET} mode"
+_HTTP_URL_FMT = f"🦆 Connect to MotherDuck MCP Server at {_BOLD_CYAN}http://%s:%d/mcp{_RESET}"
+
+# Deprecated options: (DeprecationWarning message, log message)
+_DEPRECATIONS: dict[str, tuple[str, str]] = {
+    "--saas-mode": (
+        "The '--saas-mode' flag is deprecated. Use '--motherduck-saas-mode' instead.",
+        "⚠️  '--saas-mode' is deprecated. Use '--motherduck-saas-mode' instead.",
+    ),
+    "--read-only": (
+        "The '--read-only' flag is deprecated. Read-only is now the default. "
+        "Use '--read-write' for write access.",
+        "⚠️  '--read-only' is deprecated. Read-only is now the default. "
+        "Remove '--read-only' from your config.",
+    ),
+    "--json-response": (
+        "The '--json-response' flag is deprecated and no longer needed.",
+        "⚠️  '--json-response' is deprecated and no longer needed. Remove it from your config.",
+    ),
+    "--transport stream": (
+        "The 'stream' transport is deprecated. Use 'http' instead.",
+        "⚠️  '--transport stream' is deprecated. Use '--transport http' instead.",
+    ),
+    "--transport sse": (
+        "The 'sse' transport is deprecated. Use 'http' instead.",
+        "⚠️  '--transport sse' is deprecated. Use '--transport http' instead.",
+    ),
+}
+
+_CONTEXT_SETTINGS = {"max_content_width": 100, "help_option_names": ["-h", "--help"]}
+_TRANSPORT_CHOICE = click.Choice(("stdio", "http", "sse", "stream"))
+
+# Deprecated transport aliases, mapped to their _DEPRECATIONS key
+_DEPRECATED_TRANSPORTS = {"stream": "--transport stream", "sse": "--transport sse"}
+
+
+@functools.cache
+def _warn_deprecated(option: str) -> None:
+    """Emit the deprecation warning and log line for a deprecated option once per process."""
+    warning, log_message = _DEPRECATIONS[option]
+    warnings.warn(warning, DeprecationWarning, stacklevel=3)
+    logger.warning(log_message)
+
+
+@click.command(context_settings=_CONTEXT_SETTINGS)
 @click.option(
     "--port", default=8000, envvar="MCP_PORT", help="Port to listen on for HTTP transport"
 )
@@ -27,7 +89,7 @@ logging.basicConfig(level=logging.INFO, format="[motherduck] %(levelname)s - %(m
 )
 @click.option(
     "--transport",
-    type=click.Choice(["stdio", "http", "sse", "stream"]),
+    type=_TRANSPORT_CHOICE,
     default="stdio",
     envvar="MCP_TRANSPORT",
     help=(
@@ -163,36 +225,15 @@ def main(
     """MotherDuck MCP Server - Execute SQL queries via DuckDB/MotherDuck."""
     # Handle deprecated flags with warnings
     if saas_mode:
-        warnings.warn(
-            "The '--saas-mode' flag is deprecated. Use '--motherduck-saas-mode' instead.",
-            DeprecationWarning,
-            stacklevel=2,
-        )
-        logger.warning("⚠️  '--saas-mode' is deprecated. Use '--motherduck-saas-mode' instead.")
+        _warn_deprecated("--saas-mode")
         motherduck_saas_mode = True
 
     if read_only:
-        warnings.warn(
-            "The '--read-only' flag is deprecated. Read-only is now the default. "
-            "Use '--read-write' for write access.",
-            DeprecationWarning,
-            stacklevel=2,
-        )
-        logger.warning(
-            "⚠️  '--read-only' is deprecated. Read-only is now the default. "
-            "Remove '--read-only' from your config."
-        )
         # read_only flag is effectively a no-op now since default is read-only
+        _warn_deprecated("--read-only")
 
     if json_response:
-        warnings.warn(
-            "The '--json-response' flag is deprecated and no longer needed.",
-            DeprecationWarning,
-            stacklevel=2,
-        )
-        logger.warning(
-            "⚠️  '--json-response' is deprecated and no longer needed. Remove it from your config."
-        )
+        _warn_deprecated("--json-response")
 
     # Convert read_write flag to read_only (inverted logic)
     actual_read_only = not read_write
@@ -207,43 +248,33 @@ def main(
             "  - Use --db-path md: with a MotherDuck token for cloud database access"
         )
 
-    logger.info("🦆 MotherDuck MCP Server v" + SERVER_VERSION)
-    logger.info("Ready to execute SQL queries via DuckDB/MotherDuck")
+    logger.info(_VERSION_BANNER)
+    logger.info(_READY_MESSAGE)
     if db_path == ":memory:":
         logger.info("Database mode: in-memory (read-write)")
     else:
-        mode_str = "read-write" if not actual_read_only else "read-only"
-        if actual_read_only and not ephemeral_connections:
-            mode_str += " (persistent connection)"
-        logger.info(f"Database mode: {mode_str}")
-    logger.info(f"Query result limits: {max_rows} rows, {max_chars:,} characters")
+        mode_idx = 0 if not actual_read_only else (1 if ephemeral_connections else 2)
+        logger.info("Database mode: %s", _MODE_STRINGS[mode_idx])
+    if logger.isEnabledFor(logging.INFO):
+        # %-style has no thousands separator, so group max_chars only when logging
+        logger.info("Query result limits: %d rows, %s characters", max_rows, f"{max_chars:,}")
     if query_timeout == -1:
         logger.info("Query timeout: disabled")
     else:
-        logger.info(f"Query timeout: {query_timeout}s")
+        logger.info("Query timeout: %ds", query_timeout)
     if init_sql:
         logger.info("Init SQL: configured")
     if allow_switch_databases:
         logger.info("Switch databases: enabled")
 
     # Handle deprecated transport aliases
-    if transport == "stream":
-        warnings.warn(
-            "The 'stream' transport is deprecated. Use 'http' instead.",
-            DeprecationWarning,
-            stacklevel=2,
-        )
-        logger.warning("⚠️  '--transport stream' is deprecated. Use '--transport http' instead.")
-        transport = "http"
-    elif transport == "sse":
-        warnings.warn(
-            "The 'sse' transport is deprecated. Use 'http' instead.",
-            DeprecationWarning,
-            stacklevel=2,
-        )
-        logger.warning("⚠️  '--transport sse' is deprecated. Use '--transport http' instead.")
+    if transport in _DEPRECATED_TRANSPORTS:
+        _warn_deprecated(_DEPRECATED_TRANSPORTS[transport])
         transport = "http"
 
+    # Imported here so `--help` and usage errors skip loading DuckDB/FastMCP
+    from .server import create_mcp_server
+
     # Create the FastMCP server
     mcp = create_mcp_server(
         db_path=db_path,
@@ -263,15 +294,13 @@ def main(
     # Run the server with the appropriate transport
     if transport == "http":
         if stateless_http:
-            logger.info("MCP server initialized in \033[32mhttp\033[0m mode (stateless http)")
+            logger.info("%s (stateless http)", _HTTP_MODE_MESSAGE)
         else:
-            logger.info("MCP server initialized in \033[32mhttp\033[0m mode")
-        logger.info(
-            f"🦆 Connect to MotherDuck MCP Server at \033[1m\033[36mhttp://{host}:{port}/mcp\033[0m"
-        )
+            logger.info(_HTTP_MODE_MESSAGE)
+        logger.info(_HTTP_URL_FMT, host, port)
         mcp.run(transport="http", host=host, port=port, stateless_http=stateless_http)
     else:
-        logger.info("MCP server initialized in \033[32mstdio\033[0m mode")
+        logger.info(_STDIO_MODE_MESSAGE)
         logger.info("Waiting for client connection")
         mcp.run(transport="stdio")
 
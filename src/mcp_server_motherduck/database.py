@@ -1,9 +1,13 @@
+import hashlib
+import heapq
+import itertools
 import json
 import logging
 import os
 import re
 import threading
-from typing import Any, Literal, Optional
+import time
+from typing import Any, Callable, Literal, Optional
 
 import duckdb
 
@@ -11,6 +15,21 @@ from .configs import SERVER_VERSION
 
 logger = logging.getLogger("mcp_server_motherduck")
 
+# Shared config for every duckdb.connect(); DuckDB copies it, so one dict is enough.
+# The progress bar only costs time in a headless server (and under stdio transport must
+# not reach stdout); settings that change query results are deliberately left alone.
+_DUCKDB_CONFIG = {
+    "custom_user_agent": f"mcp-server-motherduck/{SERVER_VERSION}",
+    "enable_progress_bar": False,
+}
+
+# MotherDuck connection strings already verified as read-scaling, stored as digests so
+# the token embedded in the connection string is not retained a second time.
+_verified_read_scaling: set[str] = set()
+
+# Read-scaling duckling IDs end with ".rs.<number>"
+_READ_SCALING_ID_RE = re.compile(r"\.rs\.\d+\Z")
+
 
 def quote_sql_string(value: str) -> str:
     """Return a single-quoted SQL string literal with internal quotes escaped."""
@@ -22,6 +41,65 @@ def quote_sql_identifier(value: str) -> str:
     return '"' + value.replace('"', '""') + '"'
 
 
+class _InterruptScheduler:
+    """
+    Run query-timeout callbacks from a single shared background thread.
+
+    Replaces one threading.Timer (and OS thread) per query with a heap of
+    deadlines serviced by one daemon thread, started on first use.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._deadlines: list[tuple[float, int]] = []
+        self._pending: dict[int, Callable[[], None]] = {}
+        self._tokens = itertools.count()
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> int:
+        """Run callback after delay seconds unless cancelled. Returns a cancel token."""
+        with self._cond:
+            token = next(self._tokens)
+            self._pending[token] = callback
+            heapq.heappush(self._deadlines, (time.monotonic() + delay, token))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="mcp-query-timeout", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+            return token
+
+    def cancel(self, token: int) -> None:
+        with self._cond:
+            self._pending.pop(token, None)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    # Discard cancelled entries as they reach the top of the heap
+                    while self._deadlines and self._deadlines[0][1] not in self._pending:
+                        heapq.heappop(self._deadlines)
+                    if not self._deadlines:
+                        self._cond.wait()
+                        continue
+                    deadline, token = self._deadlines[0]
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        heapq.heappop(self._deadlines)
+                        callback = self._pending.pop(token)
+                        break
+                    self._cond.wait(remaining)
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Query timeout callback failed: {e}")
+
+
+_interrupt_scheduler = _InterruptScheduler()
+
+
 def _is_read_scaling_connection(conn: duckdb.DuckDBPyConnection) -> bool:
     """
     Check if a MotherDuck connection is using read-scaling.
@@ -37,7 +115,8 @@ def _is_read_scaling_connection(conn: duckdb.DuckDBPyConnection) -> bool:
         results = conn.execute("SELECT * FROM __md_duckling_id()").fetchall()
         if results and results[0] and results[0][0]:
             duckling_id = results[0][0]
-            return bool(re.search(r"\.rs\.\d+$", duckling_id))
+            idx = duckling_id.rfind(".rs.")
+            return idx >= 0 and _READ_SCALING_ID_RE.match(duckling_id, idx) is not None
         return False
     except Exception:
         return False
@@ -103,7 +182,7 @@ class DatabaseClient:
             try:
                 conn = duckdb.connect(
                     self.db_path,
-                    config={"custom_user_agent": f"mcp-server-motherduck/{SERVER_VERSION}"},
+                    config=_DUCKDB_CONFIG,
                     read_only=self._read_only,
                 )
                 conn.execute("SELECT 1")
@@ -125,19 +204,16 @@ class DatabaseClient:
         # Check if this is an S3 path
         if self.db_type == "s3":
             # For S3, we need to create an in-memory connection and attach the S3 database
-            conn = duckdb.connect(":memory:")
-
-            # Install and load the httpfs extension for S3 support
-            import io
-            from contextlib import redirect_stderr, redirect_stdout
+            conn = duckdb.connect(":memory:", config=_DUCKDB_CONFIG)
 
-            null_file = io.StringIO()
-            with redirect_stdout(null_file), redirect_stderr(null_file):
-                try:
-                    conn.execute("INSTALL httpfs;")
-                except Exception:
-                    pass  # Extension might already be installed
-                conn.execute("LOAD httpfs;")
+            # Install and load the httpfs extension for S3 support. DuckDB does not write
+            # to Python's sys.stdout here, so no stdio redirection is needed (redirecting
+            # would swap process-global streams under concurrently logging threads).
+            try:
+                conn.execute("INSTALL httpfs;")
+            except Exception:
+                pass  # Extension might already be installed
+            conn.execute("LOAD httpfs;")
 
             # Configure S3 credentials from environment variables using CREATE SECRET
             aws_access_key = os.environ.get("AWS_ACCESS_KEY_ID")
@@ -146,43 +222,37 @@ class DatabaseClient:
             aws_region = os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
             aws_endpoint = os.environ.get("AWS_ENDPOINT")
 
-            if aws_access_key and aws_secret_key and not aws_session_token and not aws_endpoint:
+            # CREATE SECRET does not accept prepared-statement parameters, so values are
+            # inlined as escaped string literals.
+            secret_options: list[str] = []
+            if aws_access_key and aws_secret_key and not aws_session_token:
                 # Use CREATE SECRET for better credential management
-                conn.execute(f"""
-                    CREATE SECRET IF NOT EXISTS s3_secret (
-                        TYPE S3,
-                        KEY_ID '{aws_access_key}',
-                        SECRET '{aws_secret_key}',
-                        REGION '{aws_region}'
-                    );
-                """)
-            elif aws_access_key and aws_secret_key and aws_endpoint and not aws_session_token:
-                # Use CREATE SECRET with ENDPOINT when it is defined
-                conn.execute(f"""
-                    CREATE SECRET IF NOT EXISTS s3_secret (
-                        TYPE S3,
-                        KEY_ID '{aws_access_key}',
-                        SECRET '{aws_secret_key}',
-                        REGION '{aws_region}',
-                        ENDPOINT '{aws_endpoint}'
-                    );
-                """)
+                secret_options = [
+                    f"KEY_ID {quote_sql_string(aws_access_key)}",
+                    f"SECRET {quote_sql_string(aws_secret_key)}",
+                    f"REGION {quote_sql_string(aws_region)}",
+                ]
+                if aws_endpoint:
+                    secret_options.append(f"ENDPOINT {quote_sql_string(aws_endpoint)}")
             elif aws_session_token:
                 # Use credential_chain provider to automatically fetch credentials
                 # This supports IAM roles, SSO, instance profiles, etc.
-                conn.execute(f"""
-                    CREATE SECRET IF NOT EXISTS s3_secret (
-                        TYPE S3,
-                        PROVIDER credential_chain,
-                        REGION '{aws_region}'
-                    );
-                """)
+                secret_options = [
+                    "PROVIDER credential_chain",
+                    f"REGION {quote_sql_string(aws_region)}",
+                ]
+
+            if secret_options:
+                conn.execute(
+                    "CREATE SECRET IF NOT EXISTS s3_secret "
+                    f"(TYPE S3, {', '.join(secret_options)});"
+                )
 
             # Attach the S3 database
             try:
                 # For S3, we always attach as READ_ONLY since S3 storage is typically read-only
                 # Even when not in read_only mode, we attach as READ_ONLY for S3
-                conn.execute(f"ATTACH '{self.db_path}' AS s3db (READ_ONLY);")
+                conn.execute(f"ATTACH {quote_sql_string(self.db_path)} AS s3db (READ_ONLY);")
                 # Use the attached database
                 conn.execute("USE s3db;")
                 logger.info(
@@ -195,7 +265,7 @@ class DatabaseClient:
                     logger.info("S3 database doesn't exist, attempting to create it...")
                     try:
                         # Create a new database at the S3 location
-                        conn.execute(f"ATTACH '{self.db_path}' AS s3db;")
+                        conn.execute(f"ATTACH {quote_sql_string(self.db_path)} AS s3db;")
                         conn.execute("USE s3db;")
                         logger.info(f"✅ Created new S3 database at {self.db_path}")
                     except Exception as create_error:
@@ -213,7 +283,7 @@ class DatabaseClient:
 
         conn = duckdb.connect(
             self.db_path,
-            config={"custom_user_agent": f"mcp-server-motherduck/{SERVER_VERSION}"},
+            config=_DUCKDB_CONFIG,
             read_only=read_only_flag,
         )
 
@@ -221,13 +291,16 @@ class DatabaseClient:
 
         # For MotherDuck with --read-only flag, verify it's a read-scaling connection
         if self.db_type == "motherduck" and self._read_only:
-            if not _is_read_scaling_connection(conn):
-                conn.close()
-                raise ValueError(
-                    "The --read-only flag with MotherDuck requires a read-scaling token. "
-                    "You appear to be using a read/write token. Please use a read-scaling token instead. "
-                    "See: https://motherduck.com/docs/key-tasks/authenticating-and-connecting-to-motherduck/"
-                )
+            path_digest = hashlib.blake2b(self.db_path.encode(), digest_size=16).hexdigest()
+            if path_digest not in _verified_read_scaling:
+                if not _is_read_scaling_connection(conn):
+                    conn.close()
+                    raise ValueError(
+                        "The --read-only flag with MotherDuck requires a read-scaling token. "
+                        "You appear to be using a read/write token. Please use a read-scaling token instead. "
+                        "See: https://motherduck.com/docs/key-tasks/authenticating-and-connecting-to-motherduck/"
+                    )
+                _verified_read_scaling.add(path_digest)
             logger.info("Verified read-scaling connection for --read-only mode")
 
         # Execute init SQL
@@ -272,41 +345,29 @@ class DatabaseClient:
 
         # Handle MotherDuck paths
         if db_path.startswith("md:"):
-            md_params = (
-                f"&{self._motherduck_connection_parameters}"
-                if self._motherduck_connection_parameters
-                else ""
-            )
             if motherduck_token:
                 logger.info("Using MotherDuck token to connect to database `md:`")
-                if saas_mode:
-                    logger.info("Connecting to MotherDuck in SaaS mode")
-                    return (
-                        f"{db_path}?motherduck_token={motherduck_token}&saas_mode=true{md_params}",
-                        "motherduck",
-                    )
-                else:
-                    return (
-                        f"{db_path}?motherduck_token={motherduck_token}{md_params}",
-                        "motherduck",
+                token = motherduck_token
+            else:
+                token = os.environ.get("motherduck_token") or os.environ.get("MOTHERDUCK_TOKEN")
+                if not token:
+                    raise ValueError(
+                        "Please set the `motherduck_token` or `MOTHERDUCK_TOKEN` as an environment variable or pass it as an argument with `--motherduck-token` when using `md:` as db_path."
                     )
-            elif os.getenv("motherduck_token") or os.getenv("MOTHERDUCK_TOKEN"):
-                token = os.getenv("motherduck_token") or os.getenv("MOTHERDUCK_TOKEN")
                 logger.info("Using MotherDuck token from env to connect to database `md:`")
-                saas_param = "&saas_mode=true" if saas_mode else ""
-                if saas_mode:
-                    logger.info("Connecting to MotherDuck in SaaS mode")
-                return (
-                    f"{db_path}?motherduck_token={token}{saas_param}{md_params}",
-                    "motherduck",
-                )
-            else:
-                raise ValueError(
-                    "Please set the `motherduck_token` or `MOTHERDUCK_TOKEN` as an environment variable or pass it as an argument with `--motherduck-token` when using `md:` as db_path."
-                )
 
-        if db_path == ":memory:":
-            return db_path, "duckdb"
+            saas_param = "&saas_mode=true" if saas_mode else ""
+            if saas_mode:
+                logger.info("Connecting to MotherDuck in SaaS mode")
+            md_params = (
+                f"&{self._motherduck_connection_parameters}"
+                if self._motherduck_connection_parameters
+                else ""
+            )
+            return (
+                f"{db_path}?motherduck_token={token}{saas_param}{md_params}",
+                "motherduck",
+            )
 
         return db_path, "duckdb"
 
@@ -317,7 +378,7 @@ class DatabaseClient:
         if self.conn is None:
             conn = duckdb.connect(
                 self.db_path,
-                config={"custom_user_agent": f"mcp-server-motherduck/{SERVER_VERSION}"},
+                config=_DUCKDB_CONFIG,
                 read_only=self._read_only,
             )
         else:
@@ -347,21 +408,8 @@ class DatabaseClient:
                 )
 
             # Check character limit on JSON output
-            json_output = json.dumps(result, default=str)
-            if len(json_output) > self._max_chars:
-                # Progressively reduce rows until under limit
-                while rows and len(json_output) > self._max_chars:
-                    # Remove ~10% of rows each iteration
-                    remove_count = max(1, len(rows) // 10)
-                    rows = rows[:-remove_count]
-                    result["rows"] = rows
-                    result["rowCount"] = len(rows)
-                    result["truncated"] = True
-                    result["warning"] = (
-                        f"Results limited to {len(rows):,} rows due to "
-                        f"{self._max_chars // 1000}KB output size limit."
-                    )
-                    json_output = json.dumps(result, default=str)
+            if rows and len(json.dumps(result, default=str)) > self._max_chars:
+                self._truncate_to_char_limit(result)
 
             return result
 
@@ -370,6 +418,43 @@ class DatabaseClient:
             if self.conn is None:
                 conn.close()
 
+    def _char_limit_warning(self, row_count: int) -> str:
+        return (
+            f"Results limited to {row_count:,} rows due to "
+            f"{self._max_chars // 1000}KB output size limit."
+        )
+
+    def _truncate_to_char_limit(self, result: dict[str, Any]) -> None:
+        """
+        Drop trailing rows so the JSON-encoded result fits in max_chars.
+
+        Only called once the result is known to be too large. Rows are encoded one
+        at a time against the remaining budget, stopping at the first row that no
+        longer fits, so dropped rows are never encoded.
+        """
+        rows = result["rows"]
+
+        # Measure the envelope with an empty row list. rowCount and the warning still
+        # carry the untruncated count, so this is an upper bound for the final size.
+        result["rows"] = []
+        result["truncated"] = True
+        result["warning"] = self._char_limit_warning(len(rows))
+        budget = self._max_chars - len(json.dumps(result, default=str))
+
+        # json.dumps separates list items with ", "
+        kept = 0
+        used = 0
+        for row in rows:
+            used += len(json.dumps(row, default=str)) + (2 if kept else 0)
+            if used > budget:
+                break
+            kept += 1
+
+        rows = rows[:kept]
+        result["rows"] = rows
+        result["rowCount"] = len(rows)
+        result["warning"] = self._char_limit_warning(len(rows))
+
     def _execute_direct(
         self, conn: duckdb.DuckDBPyConnection, query: str
     ) -> tuple[list[str], list[str], list[list[Any]], bool]:
@@ -394,9 +479,8 @@ class DatabaseClient:
     def _execute_with_timeout(
         self, conn: duckdb.DuckDBPyConnection, query: str
     ) -> tuple[list[str], list[str], list[list[Any]], bool]:
-        """Execute query with timeout using threading.Timer and conn.interrupt()."""
-        timer = threading.Timer(self._query_timeout, conn.interrupt)
-        timer.start()
+        """Execute query with timeout using the shared interrupt scheduler and conn.interrupt()."""
+        timeout_token = _interrupt_scheduler.schedule(self._query_timeout, conn.interrupt)
 
         try:
             return self._execute_direct(conn, query)
@@ -406,7 +490,7 @@ class DatabaseClient:
                 "Increase timeout with --query-timeout argument when starting the mcp server."
             )
         finally:
-            timer.cancel()
+            _interrupt_scheduler.cancel(timeout_token)
 
     def query(self, query: str) -> dict[str, Any]:
         """Execute a SQL query and return JSON-serializable result."""
@@ -423,23 +507,28 @@ class DatabaseClient:
                 "errorType": type(e).__name__,
             }
 
-    def execute_raw(self, query: str) -> tuple[list[str], list[str], list[list[Any]]]:
+    def execute_raw(
+        self, query: str, params: list[Any] | dict[str, Any] | None = None
+    ) -> tuple[list[str], list[str], list[list[Any]]]:
         """
         Execute a query and return raw results (columns, types, rows).
         Used by catalog tools that need custom result formatting.
+
+        Values should be passed via params (? or $name placeholders) rather than
+        formatted into the SQL, so DuckDB binds them instead of re-parsing literals.
         """
         self._ensure_connected()
         if self.conn is None:
             conn = duckdb.connect(
                 self.db_path,
-                config={"custom_user_agent": f"mcp-server-motherduck/{SERVER_VERSION}"},
+                config=_DUCKDB_CONFIG,
                 read_only=self._read_only,
             )
         else:
             conn = self.conn
 
         try:
-            q = conn.execute(query)
+            q = conn.execute(query, params)
             columns = [d[0] for d in q.description] if q.description else []
             column_types = [str(d[1]) for d in q.description] if q.description else []
             rows = [list(row) for row in q.fetchall()]
@@ -5,6 +5,8 @@ These instructions are sent to the client during initialization
 to provide context about how to use the server's capabilities.
 """
 
+import functools
+
 INSTRUCTIONS_BASE = """Execute SQL queries against DuckDB and MotherDuck databases using DuckDB SQL syntax.
 
 ## Available Tools
@@ -103,6 +105,7 @@ DETACH my_db;
 """
 
 
+@functools.lru_cache(maxsize=16)
 def get_instructions(
     read_only: bool = False,
     saas_mode: bool = False,
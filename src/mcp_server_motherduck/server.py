@@ -4,6 +4,7 @@ FastMCP Server for MotherDuck and DuckDB.
 This module creates and configures the FastMCP server with all tools.
 """
 
+import functools
 import json
 import logging
 from pathlib import Path
@@ -29,6 +30,33 @@ logger = logging.getLogger("mcp_server_motherduck")
 ASSETS_DIR = Path(__file__).parent / "assets"
 ICON_PATH = ASSETS_DIR / "duck_feet_square.png"
 
+# Catalog tool annotations (always read-only)
+CATALOG_ANNOTATIONS = {
+    "readOnlyHint": True,
+    "destructiveHint": False,
+    "openWorldHint": False,
+}
+
+# Switch database annotations (open world - can connect to any database)
+SWITCH_DB_ANNOTATIONS = {
+    "readOnlyHint": False,
+    "destructiveHint": False,
+    "openWorldHint": True,
+}
+
+
+@functools.cache
+def _load_icon_data_uri() -> str | None:
+    """Read and base64-encode the server icon once per process."""
+    if not ICON_PATH.exists():
+        return None
+    return Image(path=str(ICON_PATH)).to_data_uri()
+
+
+def _to_json(result: dict) -> str:
+    """Serialize a tool result for the MCP response."""
+    return json.dumps(result, indent=2, default=str)
+
 
 def create_mcp_server(
     db_path: str,
@@ -88,17 +116,15 @@ def create_mcp_server(
     )
 
     # Create server icon from local file
-    icons = []
-    if ICON_PATH.exists():
-        img = Image(path=str(ICON_PATH))
-        icons.append(Icon(src=img.to_data_uri(), mimeType="image/png"))
+    icon_data_uri = _load_icon_data_uri()
+    icons = [Icon(src=icon_data_uri, mimeType="image/png")] if icon_data_uri else None
 
     # Create FastMCP server with icon
     mcp = FastMCP(
         name="mcp-server-motherduck",
         instructions=instructions,
         version=SERVER_VERSION,
-        icons=icons if icons else None,
+        icons=icons,
     )
 
     # Define query tool annotations (dynamic based on read_only flag)
@@ -108,20 +134,6 @@ def create_mcp_server(
         "openWorldHint": False,
     }
 
-    # Catalog tool annotations (always read-only)
-    catalog_annotations = {
-        "readOnlyHint": True,
-        "destructiveHint": False,
-        "openWorldHint": False,
-    }
-
-    # Switch database annotations (open world - can connect to any database)
-    switch_db_annotations = {
-        "readOnlyHint": False,
-        "destructiveHint": False,
-        "openWorldHint": True,
-    }
-
     # Register query tool
     @mcp.tool(
         name="execute_query",
@@ -145,15 +157,15 @@ def create_mcp_server(
         result = execute_query_fn(sql, db_client)
         if not result.get("success", True):
             # Raise exception so FastMCP marks as isError=True
-            raise ValueError(json.dumps(result, indent=2, default=str))
-        return json.dumps(result, indent=2, default=str)
+            raise ValueError(_to_json(result))
+        return _to_json(result)
 
     # Register list_databases tool
     @mcp.tool(
         name="list_databases",
         title="List Databases",
         description="List all databases available in the connection. Useful when multiple DuckDB databases are attached or when connected to MotherDuck.",
-        annotations=catalog_annotations,
+        annotations=CATALOG_ANNOTATIONS,
     )
     def list_databases_tool() -> str:
         """
@@ -163,14 +175,14 @@ def create_mcp_server(
             JSON string with database list
         """
         result = list_databases_fn(db_client)
-        return json.dumps(result, indent=2, default=str)
+        return _to_json(result)
 
     # Register list_tables tool
     @mcp.tool(
         name="list_tables",
         title="List Tables",
         description="List all tables and views in a database with their comments. If database is not specified, uses the current database.",
-        annotations=catalog_annotations,
+        annotations=CATALOG_ANNOTATIONS,
     )
     def list_tables(database: str | None = None, schema: str | None = None) -> str:
         """
@@ -184,14 +196,14 @@ def create_mcp_server(
             JSON string with table/view list
         """
         result = list_tables_fn(db_client, database, schema)
-        return json.dumps(result, indent=2, default=str)
+        return _to_json(result)
 
     # Register list_columns tool
     @mcp.tool(
         name="list_columns",
         title="List Columns",
         description="List all columns of a table or view with their types and comments. If database/schema are not specified, uses the current database/schema.",
-        annotations=catalog_annotations,
+        annotations=CATALOG_ANNOTATIONS,
     )
     def list_columns(table: str, database: str | None = None, schema: str | None = None) -> str:
         """
@@ -206,7 +218,7 @@ def create_mcp_server(
             JSON string with column list
         """
         result = list_columns_fn(table, db_client, database, schema)
-        return json.dumps(result, indent=2, default=str)
+        return _to_json(result)
 
     # Conditionally register switch_database_connection tool
     if allow_switch_databases:
@@ -217,7 +229,7 @@ def create_mcp_server(
             name="switch_database_connection",
             title="Switch Database Connection",
             description="Switch to a different database connection. For local files, use absolute paths only. The new connection respects the server's read-only/read-write mode. For local files, the file must exist unless create_if_not_exists=True (requires read-write mode).",
-            annotations=switch_db_annotations,
+            annotations=SWITCH_DB_ANNOTATIONS,
         )
         def switch_database_connection(path: str, create_if_not_exists: bool = False) -> str:
             """
@@ -238,7 +250,7 @@ def create_mcp_server(
                 server_read_only=server_read_only_mode,
                 create_if_not_exists=create_if_not_exists,
             )
-            return json.dumps(result, indent=2, default=str)
+            return _to_json(result)
 
     logger.info("FastMCP server created")
 
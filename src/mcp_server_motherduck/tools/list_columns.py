@@ -4,8 +4,6 @@ List columns tool - List all columns of a table or view.
 
 from typing import Any
 
-from ..database import quote_sql_string
-
 DESCRIPTION = (
     "List all columns of a table or view with their types and comments. "
     "If database/schema are not specified, uses the current database/schema."
@@ -31,57 +29,54 @@ def list_columns(
         JSON-serializable dict with column list or error
     """
     try:
-        # Get current database if not specified
-        if database is None:
-            _, _, db_rows = db_client.execute_raw("SELECT current_database()")
-            database = db_rows[0][0]
-
-        # Get current schema if not specified
-        if schema is None:
-            _, _, schema_rows = db_client.execute_raw("SELECT current_schema()")
-            schema = schema_rows[0][0]
-
-        # Query columns using DuckDB system function
-        sql = f"""
+        # Resolve database/schema defaults, fetch columns and probe for a view
+        # in one round-trip. The LEFT JOIN keeps a single row (with NULL column
+        # fields) when the table does not exist, so the resolved names are
+        # always available.
+        sql = """
+            WITH target AS (
+                SELECT
+                    coalesce($database::VARCHAR, current_database()) as database_name,
+                    coalesce($schema::VARCHAR, current_schema()) as schema_name
+            )
             SELECT
-                column_name as name,
-                data_type as type,
-                is_nullable = 'YES' as nullable,
-                comment
-            FROM duckdb_columns()
-            WHERE database_name = {quote_sql_string(database)}
-              AND schema_name = {quote_sql_string(schema)}
-              AND table_name = {quote_sql_string(table)}
-            ORDER BY column_index
+                t.database_name,
+                t.schema_name,
+                EXISTS (
+                    SELECT 1 FROM duckdb_views() v
+                    WHERE v.database_name = t.database_name
+                      AND v.schema_name = t.schema_name
+                      AND v.view_name = $table
+                ) as is_view,
+                c.column_name as name,
+                c.data_type as type,
+                c.is_nullable = 'YES' as nullable,
+                c.comment
+            FROM target t
+            LEFT JOIN duckdb_columns() c
+              ON c.database_name = t.database_name
+             AND c.schema_name = t.schema_name
+             AND c.table_name = $table
+            ORDER BY c.column_index
         """
 
-        _, _, rows = db_client.execute_raw(sql)
+        _, _, rows = db_client.execute_raw(
+            sql, {"database": database, "schema": schema, "table": table}
+        )
+        database, schema, is_view = rows[0][0], rows[0][1], rows[0][2]
 
         # Transform results
         columns = [
             {
-                "name": row[0],
-                "type": row[1],
-                "nullable": bool(row[2]),
-                "comment": row[3] if row[3] else None,
+                "name": row[3],
+                "type": row[4],
+                "nullable": bool(row[5]),
+                "comment": row[6] if row[6] else None,
             }
             for row in rows
+            if row[3] is not None
         ]
-
-        # Determine if it's a view or table
-        object_type = "table"
-        try:
-            _, _, view_rows = db_client.execute_raw(f"""
-                SELECT 1 FROM duckdb_views()
-                WHERE database_name = {quote_sql_string(database)}
-                  AND schema_name = {quote_sql_string(schema)}
-                  AND view_name = {quote_sql_string(table)}
-                LIMIT 1
-            """)
-            if view_rows:
-                object_type = "view"
-        except Exception:
-            pass  # Assume table if check fails
+        object_type = "view" if is_view else "table"
 
         return {
             "success": True,
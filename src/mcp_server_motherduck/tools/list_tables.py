@@ -4,8 +4,6 @@ List tables tool - List all tables and views in a database.
 
 from typing import Any
 
-from ..database import quote_sql_string
-
 DESCRIPTION = (
     "List all tables and views in a database with their comments. "
     "If database is not specified, uses the current database."
@@ -29,53 +27,67 @@ def list_tables(
         JSON-serializable dict with table/view list or error
     """
     try:
-        # Get current database if not specified
-        if database is None:
-            _, _, db_rows = db_client.execute_raw("SELECT current_database()")
-            database = db_rows[0][0]
-
         # Build schema filter
-        schema_filter = f"AND schema_name = {quote_sql_string(schema)}" if schema else ""
-
-        # Query tables and views using DuckDB system functions
-        db_quoted = quote_sql_string(database)
+        params = {"database": database}
+        schema_filter = ""
+        if schema:
+            schema_filter = "WHERE schema_name = $schema"
+            params["schema"] = schema
+
+        # Query tables and views using DuckDB system functions. The database default
+        # is resolved in the same query; the LEFT JOIN keeps a single row (with NULL
+        # object fields) when the database has no tables, so its name is always returned.
         sql = f"""
-            SELECT
-                schema_name as schema,
-                table_name as name,
-                'table' as type,
-                comment
-            FROM duckdb_tables()
-            WHERE database_name = {db_quoted} {schema_filter}
-
-            UNION ALL
-
-            SELECT
-                schema_name as schema,
-                view_name as name,
-                'view' as type,
-                comment
-            FROM duckdb_views()
-            WHERE database_name = {db_quoted} {schema_filter}
-
-            ORDER BY schema, type, name
+            WITH target AS (
+                SELECT coalesce($database::VARCHAR, current_database()) as database_name
+            ),
+            objects AS (
+                SELECT
+                    database_name,
+                    schema_name as schema,
+                    table_name as name,
+                    'table' as type,
+                    comment
+                FROM duckdb_tables()
+                {schema_filter}
+
+                UNION ALL
+
+                SELECT
+                    database_name,
+                    schema_name as schema,
+                    view_name as name,
+                    'view' as type,
+                    comment
+                FROM duckdb_views()
+                {schema_filter}
+            )
+            SELECT t.database_name, o.schema, o.name, o.type, o.comment
+            FROM target t
+            LEFT JOIN objects o ON o.database_name = t.database_name
+            ORDER BY o.schema, o.type, o.name
         """
 
-        _, _, rows = db_client.execute_raw(sql)
-
-        # Transform results
-        tables = [
-            {
-                "schema": row[0],
-                "name": row[1],
-                "type": row[2],
-                "comment": row[3] if row[3] else None,
-            }
-            for row in rows
-        ]
-
-        table_count = sum(1 for t in tables if t["type"] == "table")
-        view_count = sum(1 for t in tables if t["type"] == "view")
+        _, _, rows = db_client.execute_raw(sql, params)
+        database = rows[0][0]
+
+        # Transform results, counting tables and views in the same pass
+        tables = []
+        view_count = 0
+        for row in rows:
+            if row[2] is None:
+                continue
+            if row[3] == "view":
+                view_count += 1
+            tables.append(
+                {
+                    "schema": row[1],
+                    "name": row[2],
+                    "type": row[3],
+                    "comment": row[4] if row[4] else None,
+                }
+            )
+        table_count = len(tables) - view_count
 
         return {
             "success": True,
@@ -8,15 +8,12 @@ from typing import Any
 DESCRIPTION = "Switch to a different database connection. The new connection respects the server's read-only/read-write mode."
 
 
+_NON_LOCAL_PREFIXES = ("md:", "motherduck:", "s3://")
+
+
 def _is_local_file_path(path: str) -> bool:
     """Check if path is a local file path (not :memory:, md:, s3://, etc.)."""
-    if path == ":memory:":
-        return False
-    if path.startswith("md:") or path.startswith("motherduck:"):
-        return False
-    if path.startswith("s3://"):
-        return False
-    return True
+    return path != ":memory:" and not path.startswith(_NON_LOCAL_PREFIXES)
 
 
 def _validate_path(path: str) -> str | None:
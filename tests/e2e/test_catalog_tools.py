@@ -99,6 +99,25 @@ async def test_list_tables_with_schema_filter(memory_client):
     assert data["schema"] == "main"
 
 
+@pytest.mark.asyncio
+async def test_list_tables_follows_use(memory_client):
+    """list_tables without a database picks up a USE issued through execute_query."""
+    # Resolve (and cache) the current database before switching
+    result = await memory_client.call_tool_mcp("list_tables", {})
+    assert parse_json_result(result)["database"] == "memory"
+
+    for sql in ("ATTACH ':memory:' AS other", "USE other", "CREATE TABLE t (x INTEGER)"):
+        await memory_client.call_tool_mcp("execute_query", {"sql": sql})
+
+    result = await memory_client.call_tool_mcp("list_tables", {})
+    assert result.isError is False
+
+    data = parse_json_result(result)
+    assert data["success"] is True
+    assert data["database"] == "other"
+    assert [t["name"] for t in data["tables"]] == ["t"]
+
+
 @pytest.mark.asyncio
 async def test_list_tables_local_file(local_client):
     """list_tables returns tables from local DuckDB file."""
@@ -163,6 +182,39 @@ async def test_list_columns_memory(memory_client):
     assert "VARCHAR" in col_types["name"]
 
 
+@pytest.mark.asyncio
+async def test_list_columns_default_database_and_schema(memory_client):
+    """list_columns resolves the current database/schema when they are omitted."""
+    await memory_client.call_tool_mcp(
+        "execute_query", {"sql": "CREATE TABLE default_test (id INTEGER, label VARCHAR)"}
+    )
+
+    result = await memory_client.call_tool_mcp("list_columns", {"table": "default_test"})
+    assert result.isError is False
+
+    data = parse_json_result(result)
+    assert data["success"] is True
+    assert data["database"] == "memory"
+    assert data["schema"] == "main"
+    assert data["objectType"] == "table"
+    assert [c["name"] for c in data["columns"]] == ["id", "label"]
+    assert data["columnCount"] == 2
+
+
+@pytest.mark.asyncio
+async def test_list_columns_default_database_nonexistent_table(memory_client):
+    """list_columns still reports the resolved names when the table does not exist."""
+    result = await memory_client.call_tool_mcp("list_columns", {"table": "nonexistent_table_xyz"})
+    assert result.isError is False
+
+    data = parse_json_result(result)
+    assert data["success"] is True
+    assert data["database"] == "memory"
+    assert data["schema"] == "main"
+    assert data["columns"] == []
+    assert data["columnCount"] == 0
+
+
 @pytest.mark.asyncio
 async def test_list_columns_view(memory_client):
     """list_columns correctly identifies views."""
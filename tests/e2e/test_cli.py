@@ -0,0 +1,29 @@
+"""
+E2E tests for the command-line entry point.
+
+Runs the CLI in a fresh interpreter so import-order guarantees can be checked.
+"""
+
+import os
+import subprocess
+import sys
+
+
+def _clean_env() -> dict[str, str]:
+    """Environment without MCP_* overrides (e.g. loaded from .env by conftest)."""
+    return {k: v for k, v in os.environ.items() if not k.startswith("MCP_")}
+
+
+def test_memory_without_read_write_fails_before_loading_duckdb():
+    """In-memory without --read-write is rejected before DuckDB/FastMCP are imported."""
+    code = (
+        "import sys\n"
+        "from click.testing import CliRunner\n"
+        "from mcp_server_motherduck import main\n"
+        "result = CliRunner().invoke(main, ['--db-path', ':memory:'])\n"
+        "assert result.exit_code == 2, result.output\n"
+        "assert 'require the --read-write flag' in result.output, result.output\n"
+        "assert 'duckdb' not in sys.modules\n"
+        "assert 'fastmcp' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, timeout=30, env=_clean_env())
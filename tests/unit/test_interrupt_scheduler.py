@@ -0,0 +1,97 @@
+"""
+Unit tests for the shared query-timeout scheduler.
+"""
+
+import threading
+import time
+
+from mcp_server_motherduck.database import _InterruptScheduler
+
+
+def test_callback_fires_at_deadline():
+    """A scheduled callback runs once its delay has elapsed, not before."""
+    scheduler = _InterruptScheduler()
+    fired = threading.Event()
+    fired_at: list[float] = []
+
+    def callback():
+        fired_at.append(time.monotonic())
+        fired.set()
+
+    start = time.monotonic()
+    scheduler.schedule(0.1, callback)
+
+    assert fired.wait(2)
+    assert fired_at[0] - start >= 0.1
+
+
+def test_cancelled_token_never_fires():
+    """A callback cancelled before its deadline is never run."""
+    scheduler = _InterruptScheduler()
+    cancelled = threading.Event()
+    control = threading.Event()
+
+    token = scheduler.schedule(0.05, cancelled.set)
+    scheduler.cancel(token)
+    # Schedule a later callback so we know the deadline above has been passed
+    scheduler.schedule(0.15, control.set)
+
+    assert control.wait(2)
+    assert not cancelled.is_set()
+
+
+def test_earlier_deadline_scheduled_later_fires_first():
+    """Deadlines are ordered by time, not by scheduling order."""
+    scheduler = _InterruptScheduler()
+    order: list[str] = []
+    done = threading.Event()
+
+    def record(name):
+        def callback():
+            order.append(name)
+            if len(order) == 2:
+                done.set()
+
+        return callback
+
+    scheduler.schedule(0.3, record("late"))
+    scheduler.schedule(0.05, record("early"))
+
+    assert done.wait(2)
+    assert order == ["early", "late"]
+
+
+def test_raising_callback_does_not_stop_worker():
+    """An exception in one callback is logged and later callbacks still run."""
+    scheduler = _InterruptScheduler()
+    fired = threading.Event()
+
+    def boom():
+        raise RuntimeError("interrupt failed")
+
+    scheduler.schedule(0.01, boom)
+    scheduler.schedule(0.05, fired.set)
+
+    assert fired.wait(2)
+    assert scheduler._thread is not None and scheduler._thread.is_alive()
+
+
+def test_cancelled_entries_are_removed():
+    """Cancelled deadlines are dropped from the heap by the worker."""
+    scheduler = _InterruptScheduler()
+    fired = threading.Event()
+
+    for _ in range(5):
+        scheduler.cancel(scheduler.schedule(0.01, lambda: None))
+    scheduler.schedule(0.05, fired.set)
+
+    assert fired.wait(2)
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline:
+        with scheduler._cond:
+            if not scheduler._deadlines and not scheduler._pending:
+                break
+        time.sleep(0.01)
+    with scheduler._cond:
+        assert scheduler._deadlines == []
+        assert scheduler._pending == {}